@@ -1,280 +1,553 @@
-# backend/app.py
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-from datetime import datetime, timezone
-import uuid
-import os
-from twilio.rest import Client
-
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
-
-# -------------------------
-# Twilio config (use env vars)
-# -------------------------
-TWILIO_SID = os.environ.get("TWILIO_SID", "")
-TWILIO_AUTH = os.environ.get("TWILIO_AUTH", "")
-TWILIO_NUMBER = os.environ.get("TWILIO_NUMBER", "")  # e.g. "+15017122661"
-
-if TWILIO_SID and TWILIO_AUTH:
-    twilio_client = Client(TWILIO_SID, TWILIO_AUTH)
-else:
-    twilio_client = None
-
-# -------------------------
-# In-memory DB (demo)
-# In production, use real DB (sqlite/postgres)
-# -------------------------
-USERS_DB = {}   # { email: { profile: {...}, family: [...], history: [...] } }
-ALERTS_DB = []  # global alert log
-FAMILY_LOG_DB = []  # SMS send logs
-
-
-# -------------------------
-# Utilities
-# -------------------------
-def now_iso():
-    return datetime.now(timezone.utc).isoformat()
-
-def gen_id():
-    return "id_" + uuid.uuid4().hex[:12]
-
-def clean_and_e164(phone_raw, default_country="91"):
-    """
-    Convert a variety of phone formats into E.164 string for Twilio.
-    - Accepts: "9876543210", "919876543210", "+919876543210", "09876543210"
-    - Returns: "+919876543210" or None if invalid
-    """
-    if not phone_raw:
-        return None
-    s = str(phone_raw).strip()
-    # remove spaces, dashes, brackets
-    for ch in [" ", "-", "(", ")", "."]:
-        s = s.replace(ch, "")
-    # remove leading plus for checks
-    if s.startswith("+"):
-        s_noplus = s[1:]
-    else:
-        s_noplus = s
-
-    # If exactly 10 digits -> assume local Indian -> prefix default_country
-    if s_noplus.isdigit():
-        if len(s_noplus) == 10:
-            return f"+{default_country}{s_noplus}"
-        if len(s_noplus) == 12 and s_noplus.startswith(default_country):
-            return f"+{s_noplus}"
-        if len(s_noplus) == 11 and s_noplus.startswith("0") and s_noplus[1:].isdigit() and len(s_noplus[1:]) == 10:
-            return f"+{default_country}{s_noplus[1:]}"
-    # If s started with country code and digits
-    if s.startswith("+") and s[1:].isdigit():
-        return s
-    # fallback: return None for invalid
-    return None
-
-
-# -------------------------
-# SMS sending via Twilio
-# -------------------------
-def send_sms_twilio_single(to_e164, body_text):
-    if not twilio_client:
-        # Twilio not configured; return simulated result
-        return {"ok": False, "error": "Twilio not configured (env missing)."}
-    try:
-        msg = twilio_client.messages.create(
-            body=body_text,
-            from_=TWILIO_NUMBER,
-            to=to_e164
-        )
-        return {"ok": True, "sid": msg.sid}
-    except Exception as e:
-        return {"ok": False, "error": str(e)}
-
-
-# -------------------------
-# Simple message analyzer (rule-based)
-# Replace with HuggingFace model if you want
-# -------------------------
-def analyze_message(message_text):
-    try:
-        keywords = ["otp", "urgent", "bank", "blocked", "verify", "password", "transfer", "account", "click", "wire"]
-        lower = (message_text or "").lower()
-        is_scam = any(k in lower for k in keywords)
-        elder_warning = "⚠ This message looks suspicious. Do NOT share OTP/passwords." if is_scam else "✔ This message appears safe."
-        explanation = "Detected using keyword rules (demo)."
-        return {"is_scam": is_scam, "elder_warning": elder_warning, "explanation": explanation}
-    except Exception as e:
-        return {"is_scam": None, "elder_warning": "AI could not analyze this message.", "explanation": str(e)}
-
-
-# -------------------------
-# Save alert
-# -------------------------
-def save_alert(sender, message, analysis, user_email=None):
-    alert = {
-        "id": gen_id(),
-        "sender": sender,
-        "message": message,
-        "is_scam": analysis.get("is_scam"),
-        "elder_warning": analysis.get("elder_warning"),
-        "explanation": analysis.get("explanation"),
-        "created_at": now_iso(),
-        "user_email": user_email
-    }
-    ALERTS_DB.insert(0, alert)
-    # also store in user history if user exists
-    if user_email:
-        user = USERS_DB.setdefault(user_email, {"profile": {"email": user_email, "name": "", "phone": ""}, "family": [], "history": []})
-        user["history"].insert(0, alert)
-    return alert
-
-
-# -------------------------
-# Routes
-# -------------------------
-@app.route("/login", methods=["POST"])
-def login():
-    data = request.json or {}
-    email = (data.get("email") or "").lower()
-    if not email:
-        return jsonify({"success": False, "error": "email required"}), 400
-    # create user record if missing
-    USERS_DB.setdefault(email, {"profile": {"email": email, "name": "", "phone": ""}, "family": [], "history": []})
-    return jsonify({"success": True, "user": USERS_DB[email]})
-
-
-@app.route("/save-profile", methods=["POST"])
-def save_profile():
-    data = request.json or {}
-    email = (data.get("email") or "").lower()
-    profile = data.get("profile") or {}
-    if not email:
-        return jsonify({"success": False, "error": "email required"}), 400
-    USERS_DB.setdefault(email, {"profile": {"email": email, "name": "", "phone": ""}, "family": [], "history": []})
-    USERS_DB[email]["profile"] = profile
-    return jsonify({"success": True})
-
-
-@app.route("/save-family", methods=["POST"])
-def save_family():
-    data = request.json or {}
-    email = (data.get("email") or "").lower()
-    family = data.get("family") or []
-    if not email:
-        return jsonify({"success": False, "error": "email required"}), 400
-    USERS_DB.setdefault(email, {"profile": {"email": email, "name": "", "phone": ""}, "family": [], "history": []})
-    USERS_DB[email]["family"] = family
-    return jsonify({"success": True})
-
-
-@app.route("/alerts", methods=["GET"])
-def get_alerts():
-    # query param filter by email optional
-    email = request.args.get("email")
-    if email:
-        user = USERS_DB.get(email.lower())
-        return jsonify({"alerts": user.get("history", []) if user else []})
-    return jsonify({"alerts": ALERTS_DB})
-
-
-@app.route("/test-message", methods=["POST"])
-def test_message():
-    data = request.json or {}
-    email = (data.get("email") or "").lower()
-    sender = data.get("sender") or "User"
-    message = data.get("message") or ""
-
-    # analyze and save
-    analysis = analyze_message(message)
-    alert = save_alert(sender, message, analysis, user_email=email if email else None)
-
-    # If scam -> send SMS to user and family
-    if analysis.get("is_scam") is True:
-        recipients = set()
-        # user's phone
-        if email and USERS_DB.get(email) and USERS_DB[email]["profile"].get("phone"):
-            recipients.add(USERS_DB[email]["profile"]["phone"])
-        # family phones
-        if email and USERS_DB.get(email):
-            for m in USERS_DB[email].get("family", []):
-                phone = m.get("phone")
-                if phone:
-                    recipients.add(phone)
-        # Clean & convert to e164
-        cleaned = []
-        for ph in recipients:
-            e = clean_and_e164(ph)
-            if e:
-                cleaned.append(e)
-            else:
-                print("Invalid phone skipped:", ph)
-
-        sms_body = f"⚠ Scam alert for {sender}: {analysis.get('elder_warning')}"
-
-        sms_results = []
-        for e164 in cleaned:
-            res = send_sms_twilio_single(e164, sms_body)
-            log_entry = {
-                "id": gen_id(),
-                "to": e164,
-                "body": sms_body,
-                "result": res,
-                "created_at": now_iso()
-            }
-            FAMILY_LOG_DB.insert(0, log_entry)
-            sms_results.append(log_entry)
-
-        return jsonify({"success": True, "alert": alert, "sms_sent": sms_results})
-
-    return jsonify({"success": True, "alert": alert})
-
-
-@app.route("/send-family-alert", methods=["POST"])
-def send_family_alert():
-    data = request.json or {}
-    phones = data.get("phones", [])  # raw list from frontend
-    message_text = data.get("message", "")
-    details = data.get("details", {})
-
-    if not isinstance(phones, list) or not phones:
-        return jsonify({"success": False, "error": "phones must be a non-empty list"}), 400
-
-    # clean & e164
-    cleaned = []
-    for p in phones:
-        e = clean_and_e164(p)
-        if e:
-            cleaned.append(e)
-        else:
-            print("Invalid phone skipped (send-family-alert):", p)
-
-    if not cleaned:
-        return jsonify({"success": False, "error": "no valid phone numbers after cleaning"}), 400
-
-    sms_results = []
-    for e164 in cleaned:
-        res = send_sms_twilio_single(e164, message_text)
-        entry = {
-            "id": gen_id(),
-            "to": e164,
-            "message_sent": message_text,
-            "details": details,
-            "result": res,
-            "created_at": now_iso()
-        }
-        FAMILY_LOG_DB.insert(0, entry)
-        sms_results.append(entry)
-
-    return jsonify({"success": True, "sent": cleaned, "logs": sms_results})
-
-
-@app.route("/family-logs", methods=["GET"])
-def family_logs():
-    return jsonify({"logs": FAMILY_LOG_DB})
-
-
-# -------------------------
-# Run app
-# -------------------------
-if __name__ == "__main__":
-    print("Twilio configured:", bool(twilio_client))
-    app.run(host="0.0.0.0", port=5000, debug=True)
+# backend/app.py
+from flask import Flask, request
+from flask_cors import CORS
+from functools import lru_cache
+from itertools import islice
+import time
+import asyncio
+import collections
+import json
+import pickle
+import re
+import sqlite3
+import sys
+import threading
+import os
+import requests
+from requests.adapters import HTTPAdapter
+
+app = Flask(__name__)
+CORS(app, resources={r"/*": {"origins": "*"}})
+
+# orjson (Rust-backed) writes JSON bytes several times faster than the
+# stdlib encoder; it dominates on the list-heavy /alerts and /family-logs
+# responses. Falls back to stdlib json when not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def ojson(obj, status=200):
+    """Build a JSON response, using orjson when available."""
+    if orjson is not None:
+        body = orjson.dumps(obj)
+    else:
+        body = json.dumps(obj)
+    return app.response_class(body, status=status, mimetype="application/json")
+
+# -------------------------
+# Twilio config (use env vars)
+# -------------------------
+TWILIO_SID = os.environ.get("TWILIO_SID", "")
+TWILIO_AUTH = os.environ.get("TWILIO_AUTH", "")
+TWILIO_NUMBER = os.environ.get("TWILIO_NUMBER", "")  # e.g. "+15017122661"
+TWILIO_NOTIFY_SID = os.environ.get("TWILIO_NOTIFY_SID", "")  # optional Notify service, e.g. "ISxxxx..."
+TWILIO_API_URL = f"https://api.twilio.com/2010-04-01/Accounts/{TWILIO_SID}/Messages.json"
+TWILIO_NOTIFY_URL = f"https://notify.twilio.com/v1/Services/{TWILIO_NOTIFY_SID}/Notifications"
+
+TWILIO_CONFIGURED = bool(TWILIO_SID and TWILIO_AUTH)
+
+# -------------------------
+# Storage: SQLite (WAL) for user records so logins survive restarts,
+# with an in-memory write-through cache in front for hot reads.
+# Alert/SMS logs are bounded deques: appendleft is O(1) vs list.insert(0).
+# -------------------------
+DB_PATH = os.environ.get("ELDER_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "elder.db"))
+
+_db = sqlite3.connect(DB_PATH, check_same_thread=False)
+_db.execute("PRAGMA journal_mode=WAL")
+_db.execute("CREATE TABLE IF NOT EXISTS users (email TEXT PRIMARY KEY, profile TEXT, family TEXT)")
+_db.commit()
+_db_lock = threading.Lock()
+
+# cache over SQLite: { email: { profile: {...}, family: [...], history: deque } }
+# Bounded LRU: least-recently-used records are evicted once the cap is hit,
+# which is safe because profile/family are persisted. Per-user history is a
+# bounded deque so long-lived users cannot grow it without limit.
+USERS_DB = collections.OrderedDict()
+USERS_CACHE_MAX = 10000
+USER_HISTORY_MAX = 200
+
+
+def _new_user(email):
+    """Fresh empty user record; only built on an actual miss."""
+    return {
+        "profile": {"email": email, "name": "", "phone": ""},
+        "family": [],
+        "history": collections.deque(maxlen=USER_HISTORY_MAX),
+    }
+
+
+def _cache_user(email, user):
+    USERS_DB[email] = user
+    USERS_DB.move_to_end(email)
+    if len(USERS_DB) > USERS_CACHE_MAX:
+        USERS_DB.popitem(last=False)
+
+
+ALERTS_DB = collections.deque(maxlen=10000)  # global alert log, newest first
+FAMILY_LOG_DB = collections.deque(maxlen=10000)  # SMS send logs, newest first
+
+
+def get_user(email):
+    """Return the cached user record, loading from SQLite on a cache miss."""
+    user = USERS_DB.get(email)
+    if user is not None:
+        USERS_DB.move_to_end(email)
+        return user
+    with _db_lock:
+        row = _db.execute("SELECT profile, family FROM users WHERE email = ?", (email,)).fetchone()
+    if row is None:
+        return None
+    user = _new_user(email)
+    user["profile"] = json.loads(row[0])
+    user["family"] = json.loads(row[1])
+    _cache_user(email, user)
+    return user
+
+
+def ensure_user(email):
+    """Get or create the user record for email."""
+    user = get_user(email)
+    if user is None:
+        user = _new_user(email)
+        _cache_user(email, user)
+        persist_user(email, user)
+    return user
+
+
+def persist_user(email, user):
+    """Write-through: keep the SQLite row in sync with the cached record."""
+    with _db_lock:
+        _db.execute(
+            "INSERT OR REPLACE INTO users (email, profile, family) VALUES (?, ?, ?)",
+            (email, json.dumps(user["profile"]), json.dumps(user["family"])),
+        )
+        _db.commit()
+
+
+# -------------------------
+# Utilities
+# -------------------------
+@lru_cache(maxsize=4)
+def _iso_seconds(whole_second):
+    # All log entries within the same second share this formatted prefix,
+    # so during an SMS fan-out the cache hit rate approaches 1.
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(whole_second))
+
+
+def now_iso():
+    t = time.time()
+    s = int(t)
+    return f"{_iso_seconds(s)}.{int((t - s) * 1e6):06d}+00:00"
+
+def gen_id():
+    # 6 random bytes -> 12 hex chars, same shape as the old uuid4 slice
+    # but without constructing a UUID object per call
+    return "id_" + os.urandom(6).hex()
+
+# Deletion table for formatting chars (spaces, dashes, brackets, dots) so
+# cleaning is one C-level pass instead of five replace() calls.
+_PHONE_STRIP = str.maketrans("", "", " -().")
+
+# Fast-path validator: input already in E.164 form needs no further work.
+# Requires 12-15 digits after the plus so shorter inputs ("+9876543210",
+# "+09876543210") still go through the 10/11-digit country-code dispatch
+# below and get normalized exactly as before.
+_E164_RE = re.compile(r"^\+\d{12,15}$")
+
+
+def clean_and_e164(phone_raw, default_country="91"):
+    """
+    Convert a variety of phone formats into E.164 string for Twilio.
+    Pure and deterministic, so results are memoized: repeated alerts to
+    the same family cost a dict lookup instead of re-normalizing.
+    - Accepts: "9876543210", "919876543210", "+919876543210", "09876543210"
+    - Returns: "+919876543210" or None if invalid
+    """
+    if not phone_raw:
+        return None
+    # coerce before the cached inner so unhashable JSON values can't blow
+    # up the lru_cache
+    return _clean_and_e164(str(phone_raw), default_country)
+
+
+@lru_cache(maxsize=4096)
+def _clean_and_e164(phone_raw, default_country):
+    s = phone_raw.strip().translate(_PHONE_STRIP)
+    # already valid E.164 -> one regex match, skip the length dispatch
+    if _E164_RE.match(s):
+        return s
+    # remove leading plus for checks
+    if s.startswith("+"):
+        s_noplus = s[1:]
+    else:
+        s_noplus = s
+
+    # If exactly 10 digits -> assume local Indian -> prefix default_country
+    if s_noplus.isdigit():
+        if len(s_noplus) == 10:
+            return f"+{default_country}{s_noplus}"
+        if len(s_noplus) == 12 and s_noplus.startswith(default_country):
+            return f"+{s_noplus}"
+        if len(s_noplus) == 11 and s_noplus.startswith("0") and s_noplus[1:].isdigit() and len(s_noplus[1:]) == 10:
+            return f"+{default_country}{s_noplus[1:]}"
+    # If s started with country code and digits
+    if s.startswith("+") and s[1:].isdigit():
+        return s
+    # fallback: return None for invalid
+    return None
+
+
+def clean_phone_list(phones):
+    """Normalize a batch of raw phones; returns (cleaned, invalid) lists."""
+    pairs = [(p, clean_and_e164(p)) for p in phones]
+    return [e for _, e in pairs if e], [p for p, e in pairs if not e]
+
+
+# -------------------------
+# SMS sending via Twilio
+# -------------------------
+# Twilio calls are I/O-bound (one HTTPS round-trip each), so fan-outs to a
+# family list are POSTed straight to Twilio's REST API and awaited together
+# with asyncio.gather instead of a serial loop. A single pooled Session
+# keeps connections alive so TCP+TLS setup is paid once per burst, not
+# once per SMS.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+
+def send_sms_twilio_single(to_e164, body_text):
+    if not TWILIO_CONFIGURED:
+        # Twilio not configured; return simulated result
+        return {"ok": False, "error": "Twilio not configured (env missing)."}
+    try:
+        resp = SESSION.post(
+            TWILIO_API_URL,
+            auth=(TWILIO_SID, TWILIO_AUTH),
+            data={"To": to_e164, "From": TWILIO_NUMBER, "Body": body_text},
+            timeout=10,
+        )
+        payload = resp.json()
+        if resp.ok:
+            return {"ok": True, "sid": payload.get("sid")}
+        return {"ok": False, "error": payload.get("message", f"HTTP {resp.status_code}")}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def send_sms_notify_bulk(recipients_e164, body_text):
+    """One Twilio Notify POST covering every recipient.
+
+    Twilio fans out to the individual numbers server-side, so the network
+    cost is one round-trip regardless of family size. Returns one result
+    dict per recipient, mirroring send_sms_twilio_single.
+    """
+    try:
+        resp = SESSION.post(
+            TWILIO_NOTIFY_URL,
+            auth=(TWILIO_SID, TWILIO_AUTH),
+            data={
+                "ToBinding": [json.dumps({"binding_type": "sms", "address": e}) for e in recipients_e164],
+                "Body": body_text,
+            },
+            timeout=10,
+        )
+        payload = resp.json()
+        if resp.ok:
+            return [{"ok": True, "sid": payload.get("sid")} for _ in recipients_e164]
+        error = payload.get("message", f"HTTP {resp.status_code}")
+    except Exception as e:
+        error = str(e)
+    return [{"ok": False, "error": error} for _ in recipients_e164]
+
+
+async def send_sms_fanout(recipients_e164, body_text):
+    """Send body_text to every number in recipients_e164 concurrently.
+
+    Returns results in the same order as recipients_e164.
+    """
+    if TWILIO_CONFIGURED and TWILIO_NOTIFY_SID:
+        return await asyncio.to_thread(send_sms_notify_bulk, recipients_e164, body_text)
+    return await asyncio.gather(
+        *(asyncio.to_thread(send_sms_twilio_single, e, body_text) for e in recipients_e164)
+    )
+
+
+# -------------------------
+# Simple message analyzer (rule-based)
+# Replace with HuggingFace model if you want
+# -------------------------
+SCAM_KEYWORDS = ("otp", "urgent", "bank", "blocked", "verify", "password", "transfer", "account", "click", "wire")
+
+# Precomputed once for the fallback scanner: keywords as bytes, plus an
+# ASCII lowercase table so the input is lowered in one bytes.translate pass
+# instead of allocating a lowered str copy.
+SCAM_KEYWORDS_B = tuple(k.encode("ascii") for k in SCAM_KEYWORDS)
+_TO_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+# Optional top tier: Hyperscan JIT-compiles all patterns into one
+# SIMD-accelerated DFA. Only pays off once the keyword list grows into the
+# hundreds (brands, multi-language phrases), so it is not a hard dependency.
+try:
+    import hyperscan
+
+    SCAM_HS_DB = hyperscan.Database()
+    SCAM_HS_DB.compile(
+        expressions=[k.encode("ascii") for k in SCAM_KEYWORDS],
+        ids=list(range(len(SCAM_KEYWORDS))),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(SCAM_KEYWORDS),
+    )
+except ImportError:
+    SCAM_HS_DB = None
+
+# Build an Aho-Corasick automaton once at import so every message is scanned
+# in a single pass instead of one substring search per keyword. The built
+# automaton is pickled to disk so subsequent boots skip construction; the
+# cache is invalidated whenever the keyword list changes.
+_AUTOMATON_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scam_automaton.pkl")
+
+try:
+    import ahocorasick
+
+    SCAM_AUTOMATON = None
+    try:
+        with open(_AUTOMATON_CACHE, "rb") as f:
+            cached_keywords, cached_automaton = pickle.load(f)
+        if cached_keywords == SCAM_KEYWORDS:
+            SCAM_AUTOMATON = cached_automaton
+    except Exception:
+        pass  # missing/stale cache: rebuild below
+    if SCAM_AUTOMATON is None:
+        SCAM_AUTOMATON = ahocorasick.Automaton()
+        for k in SCAM_KEYWORDS:
+            SCAM_AUTOMATON.add_word(k, k)
+        SCAM_AUTOMATON.make_automaton()
+        try:
+            with open(_AUTOMATON_CACHE, "wb") as f:
+                pickle.dump((SCAM_KEYWORDS, SCAM_AUTOMATON), f, protocol=5)
+        except OSError:
+            pass  # read-only filesystem: just rebuild next boot
+except ImportError:
+    # pyahocorasick not installed; fall back to the plain substring scan
+    SCAM_AUTOMATON = None
+
+# Interned once so analyze_message returns the same string objects by
+# reference instead of re-allocating the warnings per call.
+WARN_SCAM = sys.intern("⚠ This message looks suspicious. Do NOT share OTP/passwords.")
+WARN_SAFE = sys.intern("✔ This message appears safe.")
+
+
+def find_scam_keyword(message_text):
+    """Return the first scam keyword found in message_text, or None."""
+    if SCAM_HS_DB is not None:
+        hits = []
+
+        def on_match(pat_id, start, end, flags, ctx=None):
+            hits.append(pat_id)
+            return 1  # non-zero stops the scan at the first hit
+
+        try:
+            SCAM_HS_DB.scan(message_text.encode("utf-8", "ignore"), match_event_handler=on_match)
+        except hyperscan.error:
+            pass  # scan terminated early by the handler
+        return SCAM_KEYWORDS[hits[0]] if hits else None
+    if SCAM_AUTOMATON is not None:
+        hit = next(SCAM_AUTOMATON.iter(message_text.lower()), None)
+        return hit[1] if hit else None
+    # Fallback: scan as lowered bytes (C-level two-way substring search)
+    b = message_text.encode("utf-8", "ignore").translate(_TO_LOWER)
+    hit = next((k for k in SCAM_KEYWORDS_B if k in b), None)
+    return hit.decode("ascii") if hit else None
+
+
+def analyze_message(message_text):
+    try:
+        matched = find_scam_keyword(message_text or "")
+        is_scam = matched is not None
+        elder_warning = WARN_SCAM if is_scam else WARN_SAFE
+        explanation = f"Detected keyword '{matched}' (demo rules)." if is_scam else "Detected using keyword rules (demo)."
+        return {"is_scam": is_scam, "elder_warning": elder_warning, "explanation": explanation}
+    except Exception as e:
+        return {"is_scam": None, "elder_warning": "AI could not analyze this message.", "explanation": str(e)}
+
+
+# -------------------------
+# Save alert
+# -------------------------
+def save_alert(sender, message, analysis, user_email=None):
+    alert = {
+        "id": gen_id(),
+        "sender": sender,
+        "message": message,
+        "is_scam": analysis.get("is_scam"),
+        "elder_warning": analysis.get("elder_warning"),
+        "explanation": analysis.get("explanation"),
+        "created_at": now_iso(),
+        "user_email": user_email
+    }
+    ALERTS_DB.appendleft(alert)
+    # also store in user history if user exists
+    if user_email:
+        ensure_user(user_email)["history"].appendleft(alert)
+    return alert
+
+
+# -------------------------
+# Routes
+# -------------------------
+@app.route("/login", methods=["POST"])
+def login():
+    data = request.json or {}
+    email = (data.get("email") or "").lower()
+    if not email:
+        return ojson({"success": False, "error": "email required"}, 400)
+    # create user record if missing
+    user = ensure_user(email)
+    return ojson({"success": True, "user": {**user, "history": list(user["history"])}})
+
+
+@app.route("/save-profile", methods=["POST"])
+def save_profile():
+    data = request.json or {}
+    email = (data.get("email") or "").lower()
+    profile = data.get("profile") or {}
+    if not email:
+        return ojson({"success": False, "error": "email required"}, 400)
+    user = ensure_user(email)
+    user["profile"] = profile
+    persist_user(email, user)
+    return ojson({"success": True})
+
+
+@app.route("/save-family", methods=["POST"])
+def save_family():
+    data = request.json or {}
+    email = (data.get("email") or "").lower()
+    family = data.get("family") or []
+    if not email:
+        return ojson({"success": False, "error": "email required"}, 400)
+    user = ensure_user(email)
+    user["family"] = family
+    persist_user(email, user)
+    return ojson({"success": True})
+
+
+def _alerts_page(entries, limit, before_id):
+    """One newest-first page, resuming after before_id when given."""
+    it = iter(entries)
+    if before_id:
+        for entry in it:
+            if entry["id"] == before_id:
+                break
+    return list(islice(it, limit))
+
+
+@app.route("/alerts", methods=["GET"])
+def get_alerts():
+    # query param filter by email optional; ?limit= caps the page size so
+    # serialization stays O(limit) instead of O(total alerts), and
+    # ?before_id= is a cursor: pass the id of the last alert received to
+    # fetch the next (older) page
+    email = request.args.get("email")
+    limit = max(0, request.args.get("limit", 50, type=int))
+    before_id = request.args.get("before_id")
+    if email:
+        user = get_user(email.lower())
+        history = user.get("history", []) if user else []
+        return ojson({"alerts": _alerts_page(history, limit, before_id)})
+    return ojson({"alerts": _alerts_page(ALERTS_DB, limit, before_id)})
+
+
+@app.route("/test-message", methods=["POST"])
+async def test_message():
+    data = request.json or {}
+    email = (data.get("email") or "").lower()
+    sender = data.get("sender") or "User"
+    message = data.get("message") or ""
+
+    # analyze and save
+    analysis = analyze_message(message)
+    alert = save_alert(sender, message, analysis, user_email=email if email else None)
+
+    # If scam -> send SMS to user and family
+    if analysis.get("is_scam") is True:
+        recipients = set()
+        user = get_user(email) if email else None
+        if user:
+            # user's phone
+            phone = user["profile"].get("phone")
+            if phone:
+                recipients.add(phone)
+            # family phones
+            for m in user.get("family", []):
+                phone = m.get("phone")
+                if phone:
+                    recipients.add(phone)
+        # Clean & convert to e164
+        cleaned, invalid = clean_phone_list(recipients)
+        for ph in invalid:
+            print("Invalid phone skipped:", ph)
+
+        sms_body = f"⚠ Scam alert for {sender}: {analysis.get('elder_warning')}"
+
+        # fields shared by every log entry in this fan-out: one template
+        # dict and one timestamp for the whole burst
+        base_log = {"body": sms_body, "created_at": now_iso()}
+        sms_results = []
+        for e164, res in zip(cleaned, await send_sms_fanout(cleaned, sms_body)):
+            log_entry = {"id": gen_id(), "to": e164, "result": res, **base_log}
+            FAMILY_LOG_DB.appendleft(log_entry)
+            sms_results.append(log_entry)
+
+        return ojson({"success": True, "alert": alert, "sms_sent": sms_results})
+
+    return ojson({"success": True, "alert": alert})
+
+
+@app.route("/send-family-alert", methods=["POST"])
+async def send_family_alert():
+    data = request.json or {}
+    phones = data.get("phones", [])  # raw list from frontend
+    message_text = data.get("message", "")
+    details = data.get("details", {})
+
+    if not isinstance(phones, list) or not phones:
+        return ojson({"success": False, "error": "phones must be a non-empty list"}, 400)
+
+    # clean & e164
+    cleaned, invalid = clean_phone_list(phones)
+    for p in invalid:
+        print("Invalid phone skipped (send-family-alert):", p)
+
+    if not cleaned:
+        return ojson({"success": False, "error": "no valid phone numbers after cleaning"}, 400)
+
+    base_log = {"message_sent": message_text, "details": details, "created_at": now_iso()}
+    sms_results = []
+    for e164, res in zip(cleaned, await send_sms_fanout(cleaned, message_text)):
+        entry = {"id": gen_id(), "to": e164, "result": res, **base_log}
+        FAMILY_LOG_DB.appendleft(entry)
+        sms_results.append(entry)
+
+    return ojson({"success": True, "sent": cleaned, "logs": sms_results})
+
+
+@app.route("/family-logs", methods=["GET"])
+def family_logs():
+    return ojson({"logs": list(FAMILY_LOG_DB)})
+
+
+# -------------------------
+# Run app
+# -------------------------
+# The built-in Werkzeug server below is for local development only — it
+# handles one request at a time. In production run under gunicorn so many
+# Twilio calls can be in flight at once (Flask stays a WSGI app even with
+# async views, so use threaded workers, not ASGI ones):
+#   gunicorn app:app -w 4 -k gthread --threads 8 --bind 0.0.0.0:5000
+if __name__ == "__main__":
+    print("Twilio configured:", TWILIO_CONFIGURED)
+    # opt into the debugger/reloader explicitly; never enable in production
+    app.run(host="0.0.0.0", port=5000, debug=os.environ.get("FLASK_DEBUG") == "1")